@@ -28,24 +28,30 @@
 # SOFTWARE.
 
 
-# Required for .CSV file operations
-import csv
 # Required for datetime.date()
 import datetime
-# Required for zlib.adler32()
-import zlib
+# Required for zlib.adler32(). The optional zlib-ng package has a faster (SIMD) Adler-32 with
+# the same API, so use it when it's installed.
+try:
+    from zlib_ng import zlib_ng as zlib
+except ImportError:
+    import zlib
 # Required for sys.argv, keyboard input, sys.exc_info(), sys.exit()
 import sys
 # Required for atexit.register()
 import atexit
-# Required for time.time()
+# Required for signal.signal()
+import signal
+# Required for time.time_ns()
 import time
 # Required for random number generation
 import random
-# Required for regular expressions
-import re
-# Required for the main command line argument parser
-import argparse
+# Required for types.SimpleNamespace()
+import types
+# Required for io.StringIO()
+import io
+# Required for threading.Timer() and threading.RLock()
+import threading
 # Required for os._exit()
 import os
 
@@ -78,27 +84,69 @@ WARNING_DB_VALIDATION = 'Could not validate all database row checksums in {0}'
 WARNING_DB_CORRUPTION = 'Significant corruption in {0} -- Attempting to write anyway'
 ERROR_DB_PERMISSION = 'You do not have permission to access {0}'
 
+# Used for the database .CSV file format
+DB_EMPTY_STRING = ''
+DB_DELIMITER_STRING = ','
+DB_DELIMITER_BYTES = b','
+# The same line ending csv.writer uses, so older log files stay consistent
+DB_LINE_TERMINATOR = '\r\n'
+DB_LINE_TERMINATOR_BYTES = b'\r\n'
+# None of the columns ever need quoting, so rows are formatted directly
+DB_ROW_FORMAT = DB_DELIMITER_STRING.join(('{0}', '{1}', '{2}', '{3}', '{4}')) + DB_LINE_TERMINATOR
+DB_ENCODING = 'utf-8'
+DB_FILENAME_PREFIX = 'phase-deuce-log_'
+DB_FILENAME_SUFFIX = '.csv'
+DB_COLUMN_UNIX_TIME = 0
+DB_COLUMN_FULL_NAME = 1
+DB_COLUMN_EMAIL_ADDRESS = 2
+DB_COLUMN_PHONE_NUMBER = 3
+DB_COLUMN_CHECKSUM = 4
+# The columns covered by the checksum, in order
+DB_CHECKSUMMED_COLUMNS = (DB_COLUMN_UNIX_TIME, DB_COLUMN_FULL_NAME, DB_COLUMN_EMAIL_ADDRESS,
+                          DB_COLUMN_PHONE_NUMBER)
+# The Adler-32 of no data, which is the starting value for a chained checksum
+DB_CHECKSUM_SEED = 1
+# New rows are written to the file in batches: as soon as this many characters are waiting, or
+# when this many seconds have passed since the last write. A timer makes sure that no row waits
+# longer than that, even if no more rows arrive.
+DB_FLUSH_SIZE = 8192
+DB_FLUSH_INTERVAL_SECONDS = 1.0
+
 # Used for keypress handling
 KEY_SPACE = ' '
 KEY_Q = 'Q'
+KEY_V = 'V'
 KEY_X = 'X'
 KEY_CTRL_C = '\x03'
+# Either case of a letter is accepted
+KEYS_VALIDATE = frozenset((KEY_V, KEY_V.lower()))
+KEYS_EXIT = frozenset((KEY_Q, KEY_Q.lower(), KEY_X, KEY_X.lower(), KEY_CTRL_C))
 
 # Standard log messages during the course of execution
 APP_STARTUP_MSG = 'Application startup'
 APP_SHUTDOWN_MSG = 'Application shutdown'
 LOG_ENTRY_MSG = 'Daily Log entry written'
+LOG_VALIDATION_MSG = 'Daily Log validated'
 OS_DETECT_POSIX_MSG = 'Detected operating system: Linux/macOS'
 OS_DETECT_NONPOSIX_MSG = 'Detected operating system: Windows'
+SIGNAL_EXIT_MSG = 'Exiting on signal {0}'
+
+# Signals that end the program through Application.shutdown(), so that waiting rows are written.
+# SIGHUP is sent when the terminal is closed. (Not every signal exists on every OS.)
+EXIT_SIGNAL_NAMES = ('SIGHUP', 'SIGTERM')
 
-# Used for identity indexing
-ID_NAME = 0
-ID_EMAIL = 1
-ID_PHONE = 2
+# Used for UNIX time calculation
+NANOSECONDS_PER_SECOND = 1_000_000_000
 
 # Used for Operating System detection
 OS_WINDOWS = 1
 OS_NON_WINDOWS = 2
+# The operating system is detected once, when the program loads (termios only exists on POSIX)
+try:
+    import termios
+    CURRENT_OS = OS_NON_WINDOWS
+except ImportError:
+    CURRENT_OS = OS_WINDOWS
 
 # SSOT for the web URL
 WEB_URL = 'https://github.com/gregkrsak/phase-deuce'
@@ -107,7 +155,8 @@ WEB_URL = 'https://github.com/gregkrsak/phase-deuce'
 WELCOME_BANNER_LINE1 = 'Welcome to phase-deuce'
 WELCOME_BANNER_LINE2 = 'Written by Greg M. Krsak (greg.krsak@gmail.com)'
 WELCOME_BANNER_LINE3 = 'Contribute or file bugs here: {0}'.format(WEB_URL)
-WELCOME_BANNER_LINE4 = 'Press SPACE to add a new log entry. Press Q or X or CTRL-C to exit.'
+WELCOME_BANNER_LINE4 = 'Press SPACE to add a new log entry. Press V to validate the log. ' \
+                       + 'Press Q or X or CTRL-C to exit.'
 
 # Used for -h or --help arguments
 ARG_HELP_DESCRIPTION =  'Welcome to the daily log. {0}'.format(WEB_URL)
@@ -115,6 +164,9 @@ ARG_HELP_DESCRIPTION =  'Welcome to the daily log. {0}'.format(WEB_URL)
 ARG_DATE_SHORT = '-d'
 ARG_DATE_LONG = '--date'
 ARG_DATE_DESCRIPTION = 'The desired logfile date in ISO 8601 format (YYYY-MM-DD)'
+# Used for --verify arguments
+ARG_VERIFY_LONG = '--verify'
+ARG_VERIFY_DESCRIPTION = 'Re-validate the logfile checksums after every new log entry'
 
 # Used for exception handling
 EXCEPTION_GENERAL_MSG = 'Caught exception in {1}: {0}'
@@ -124,10 +176,36 @@ EXCEPTION_DATE_INVALID_MSG = 'Date argument is invalid (Should be YYYY-MM-DD)'
 # Have a problem? Use a regular expression. Now you have two problems!
 # This regex validates an ISO 8601 date with the format YYYY-MM-DD
 # Ref: https://stackoverflow.com/questions/22061723/regex-date-validation-for-yyyy-mm-dd
-REGEX_ISO8601_DATEONLY = '^\d{4}\-(0[1-9]|1[012])\-(0[1-9]|[12][0-9]|3[01])$'
-# This regex validates a 10-digit NANP telephone number with the format NPA-NXX-XXXX
-# Ref: https://www.oreilly.com/library/view/regular-expressions-cookbook/9781449327453/ch04s02.html
-REGEX_PHONE_US10DIGIT = '^\(?([2-9][0-8][0-9])\)?[-.]?([2-9][0-9]{2})[-.]?([0-9]{4})$'
+REGEX_ISO8601_DATEONLY = r'^\d{4}\-(0[1-9]|1[012])\-(0[1-9]|[12][0-9]|3[01])$'
+
+# Used for phone number formatting (NPA-NXX-XXXX)
+PHONE_NUMBER_FORMAT = '{0:03d}-{1:03d}-{2:04d}'
+
+# Used for identity generation
+FIRST_NAMES = ('Robert', 'Shawn', 'William', 'James', 'Oliver', 'Benjamin', \
+               'Elijah', 'Lucas', 'Dick', 'Logan', 'Alexander', 'Ethan', \
+               'Jacob', 'Michael', 'Daniel', 'Henry', 'Jackson', 'Sebastian', \
+               'Peter', 'Matthew', 'Samuel', 'David', 'Joseph', 'Carter', \
+               'Mary', 'Patricia', 'Linda', 'Barbara', 'Elizabeth', 'Jennifer', \
+               'Maria', 'Susan', 'Margaret', 'Dorothy', 'Lisa', 'Nancy', \
+               'Karen', 'Betty', 'Helen', 'Sandra', 'Donna', 'Carol', \
+               'Ruth', 'Sharon', 'Michelle', 'Laura', 'Sarah', 'Kimberly')
+LAST_NAMES = ('Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Miller', \
+              'Davis', 'Wilson', 'Anderson', 'Taylor', 'Moore', 'Thomas', \
+              'Jackson', 'White', 'Harris', 'Martin', 'Thompson', 'Garcia', \
+              'Martinez', 'Robinson', 'Clark', 'Rodriguez', 'Lewis', 'Lee', \
+              'Walker', 'Hall', 'Allen', 'Young', 'Hernandez', 'King', \
+              'Wang', 'Devi', 'Zhang', 'Li', 'Liu', 'Singh', \
+              'Yang', 'Kumar', 'Wu', 'Xu')
+# Each name paired with its lowercase form (used for email addresses), computed once
+FIRST_NAME_PAIRS = tuple((name, name.lower()) for name in FIRST_NAMES)
+LAST_NAME_PAIRS = tuple((name, name.lower()) for name in LAST_NAMES)
+EMAIL_DOMAINS = ('gmail.com', 'outlook.com', 'yahoo.com', 'icloud.com', 'aol.com', 'mail.com')
+# Email address styles. The arguments are: 0:first 1:last 2:first initial 3:domain
+EMAIL_FORMATS = ('{0}.{1}@{3}',   # first.last@domain
+                 '{1}.{0}@{3}',   # last.first@domain
+                 '{0}{1}@{3}',    # firstlast@domain
+                 '{2}{1}@{3}')    # flast@domain
 
 
 ##########################################################################################
@@ -148,14 +226,10 @@ def init(argv):
 def detect_os():
     """
     A rudamentary way to detect whether we are on Windows or a non-Windows operating system.
+    The detection itself happens once, when the program loads (see CURRENT_OS).
     :return: OS_WINDOWS or OS_NON_WINDOWS depending on the operating system.
     """
-    result = OS_NON_WINDOWS
-    try:
-        import termios
-    except ImportError:
-        result = OS_WINDOWS
-    return result
+    return CURRENT_OS
 
 
 def _find_getch():
@@ -163,15 +237,16 @@ def _find_getch():
     Determines the OS-specific function to return a keypress.
     I am not the author of this function-- See the reference.
     Ref: https://stackoverflow.com/questions/510357/python-read-a-single-character-from-the-user
-    :return: a Function object appropriate to the detected operating system.
+    :return: a Function object appropriate to the detected operating system. The function
+             returns a str on every operating system.
     """
-    if detect_os() == OS_NON_WINDOWS:
+    if CURRENT_OS == OS_NON_WINDOWS:
         # POSIX
         import termios
     else:
-        # Non-POSIX. Return msvcrt's (Windows') getch.
+        # Non-POSIX. Return msvcrt's (Windows') getch, wrapped so that it returns a str.
         import msvcrt
-        return msvcrt.getch
+        return lambda: str(msvcrt.getch(), 'utf-8')
 
     # POSIX system. Create and return a getch that manipulates the tty.
     import sys, tty
@@ -248,32 +323,35 @@ class Application(Controller):
         self.log = Log(LOG_LEVEL_INFO)
 
         result = True
+        self.args = None
         try:
-            # Create the parser object for command line arguments
-            parser = argparse.ArgumentParser(description=ARG_HELP_DESCRIPTION)
-            # Define the -d or --date argument
-            parser.add_argument(ARG_DATE_SHORT,
-                                ARG_DATE_LONG,
-                                help=ARG_DATE_DESCRIPTION,
-                                required=False)
-            # Execute the argument parser (this will cause a SystemExit exception on -h or --help)
-            self.args = parser.parse_args()
+            # Parse the command line (this will cause a SystemExit exception on -h or --help)
+            self.args = self.parse_args(sys.argv[1:])
             # Register the shutdown function
             atexit.register(self.shutdown)
+            # Make sure the shutdown function also runs when the program is killed or hung up
+            for signal_name in EXIT_SIGNAL_NAMES:
+                if hasattr(signal, signal_name):
+                    signal.signal(getattr(signal, signal_name), self.handle_signal)
             # Determine the proper (OS-specific) function to get keypresses
             self.getch = _find_getch()
-            # Initialize the random number generator
-            random.seed()
             # Initialize the primary MVC view to be an instance of the Log class
             self.view = self.log
             # Initialize the primary MVC model
             self.model = Database(self.view, self.args)
             # Validate the command line arguments. May raise a ValueError exception.
             self.validate_args()
+            # Validate the existing database once. New rows are only re-validated with --verify.
+            self.model.validate()
         except SystemExit:
-            # This exception is thrown by the argument parser
             result = False
+            # A signal can only arrive once the arguments are parsed, and must let
+            # Application.shutdown() run
+            if self.args is not None:
+                raise
+            # Otherwise, this exception was thrown by the argument parser
             self.log.debug(EXCEPTION_SYSTEMEXIT_MSG)
+            self.log.update()
             # Hard exit with a failure code. Note that this will bypass Application.shutdown()
             os._exit(EXIT_FAILURE_USAGE)
         except ValueError as e:
@@ -282,7 +360,7 @@ class Application(Controller):
             self.log.error(str(e))
             # Exit with a failure code
             sys.exit(EXIT_FAILURE_USAGE)
-        except:
+        except Exception:
             # Catch any other exception and do not raise
             result = False
             e = sys.exc_info()[0]
@@ -290,7 +368,7 @@ class Application(Controller):
         finally:
             self.log.system(result, APP_STARTUP_MSG)
 
-        if detect_os() == OS_WINDOWS:
+        if CURRENT_OS == OS_WINDOWS:
             self.log.debug(OS_DETECT_NONPOSIX_MSG)
         else:
             self.log.debug(OS_DETECT_POSIX_MSG)
@@ -308,11 +386,9 @@ class Application(Controller):
         self.log.info(WELCOME_BANNER_LINE4)
 
         while the_user_still_wants_to_run_this_application:
-            # Get a keypress from the user.
-            if detect_os() == OS_NON_WINDOWS:
-                user_input = self.getch()
-            else:
-                user_input = str(self.getch(), 'utf-8')
+            # Show any waiting log messages, then get a keypress from the user.
+            self.log.update()
+            user_input = self.getch()
             # Did the user press SPACE?
             if user_input == KEY_SPACE:
                 # Add a new row to the database
@@ -327,15 +403,26 @@ class Application(Controller):
                 if db_result == DB_RESULT_GENERAL_FAILURE or db_result == DB_RESULT_NO_PERMISSION:
                     write_succeeded = False
                 self.log.system(write_succeeded, LOG_ENTRY_MSG)
+            # Did the user press V?
+            elif user_input in KEYS_VALIDATE:
+                # Re-check every row in the file, since any of them may have been changed
+                db_result = self.model.validate(full=True)
+                self.log.system(db_result == DB_RESULT_OK, LOG_VALIDATION_MSG)
             # Did the user press Q or X or CTRL-C?
-            elif user_input.upper() == KEY_Q \
-                or user_input.upper() == KEY_X \
-                or user_input == KEY_CTRL_C:
+            elif user_input in KEYS_EXIT:
                 # Application will exit
                 the_user_still_wants_to_run_this_application = False
 
         return EXIT_SUCCESS
 
+    def handle_signal(self, signal_number, frame):
+        """
+        Exits on one of the EXIT_SIGNAL_NAMES signals, which runs Application.shutdown().
+        :return: Will exit with an EXIT_FAILURE_GENERAL code.
+        """
+        self.log.debug(SIGNAL_EXIT_MSG.format(signal_number))
+        sys.exit(EXIT_FAILURE_GENERAL)
+
     def shutdown(self):
         """
         Performs tasks for the Application instance that should happen on shutdown.
@@ -343,13 +430,58 @@ class Application(Controller):
         """
         result = True
         try:
-            pass # Do nothing
+            # Write any waiting rows and close the database file
+            self.model.close()
         except:
             # Was an exception thrown?
             result = False
         self.log.system(result, APP_SHUTDOWN_MSG)
         return
 
+    def parse_args(self, argv):
+        """
+        Parses the command line arguments. The usual command lines are scanned by hand, so that
+        the (comparatively slow) argparse module is only loaded for -h, --help, or bad arguments.
+        :return: an object with 'date' and 'verify' attributes.
+        :raises: SystemExit: Help was requested, or the arguments are invalid
+        """
+        args = types.SimpleNamespace(date=None, verify=False)
+        index = 0
+        while index < len(argv):
+            arg = argv[index]
+            if arg in (ARG_DATE_SHORT, ARG_DATE_LONG) \
+                and index + 1 < len(argv) \
+                and not argv[index + 1].startswith('-'):
+                args.date = argv[index + 1]
+                index += 2
+            elif arg == ARG_VERIFY_LONG:
+                args.verify = True
+                index += 1
+            else:
+                # Let argparse print the help text or usage error, and raise SystemExit
+                return self.argument_parser().parse_args(argv)
+        return args
+
+    def argument_parser(self):
+        """
+        Creates the argparse parser for the command line arguments.
+        :return: an argparse.ArgumentParser object.
+        """
+        # Imported here, since it's only needed for -h, --help, or bad arguments
+        import argparse
+        # Create the parser object for command line arguments
+        parser = argparse.ArgumentParser(description=ARG_HELP_DESCRIPTION)
+        # Define the -d or --date argument
+        parser.add_argument(ARG_DATE_SHORT,
+                            ARG_DATE_LONG,
+                            help=ARG_DATE_DESCRIPTION,
+                            required=False)
+        # Define the --verify argument
+        parser.add_argument(ARG_VERIFY_LONG,
+                            help=ARG_VERIFY_DESCRIPTION,
+                            action='store_true')
+        return parser
+
     def validate_args(self):
         """
         Validates the command line arguments. Raises an exception on failure.
@@ -357,8 +489,10 @@ class Application(Controller):
         :raises: ValueError: A command line argument is invalid
         """
         # Check the -d parameter
-        date_regex = re.compile(REGEX_ISO8601_DATEONLY)
         if self.args.date:
+            # Imported here, since it's only needed for the -d parameter (which is checked once)
+            import re
+            date_regex = re.compile(REGEX_ISO8601_DATEONLY)
             if not date_regex.match(self.args.date):
                 raise ValueError(EXCEPTION_DATE_INVALID_MSG)
         return
@@ -371,44 +505,54 @@ class Database(Model):
     The row format is: unix_time,full_name,email_address,phone_number,checksum
     """
 
-    empty_string = ''
-    delimiter_string = ','
-    quote_string = '"'
-
-    encoding = 'utf-8'
-
-    filename_prefix = 'phase-deuce-log_'
-    filename_suffix = '.csv'
-
-    column_unix_time = 0
-    column_full_name = 1
-    column_email_address = 2
-    column_phone_number = 3
-    column_checksum = 4
-
     def __init__(self, log, command_line_args):
         super().__init__(log)
         self.command_line_args = command_line_args
+        # The date and filename last calculated by todays_filename()
+        self.cached_date = None
+        self.cached_filename = None
+        # Byte offsets (per filename) up to which the rows have already been validated. After a
+        # checksum failure, this is the start of the failing row, so a re-scan skips the rows
+        # before it.
+        self.validated_offsets = {}
+        # The database file stays open for appending between writes
+        self.file = None
+        self.filename = None
+        # Rows waiting to be written to the open file, already formatted as .CSV
+        self.stage = io.StringIO()
+        self.last_flush_time = time.monotonic()
+        # Writes waiting rows after DB_FLUSH_INTERVAL_SECONDS, if nothing else has by then
+        self.flush_timer = None
+        # Guards the stage and the file, which are also used from the flush timer's thread
+        self.lock = threading.RLock()
 
     def todays_filename(self):
         """
         Calculates today's filename string using the ISO 8601 format date.
+        The filename is cached, and only rebuilt when the date changes.
         :return: A string with the format "phase-deuce-log_YYYY-MM-DD.csv".
         """
         # Check to see if a date was provided in the command line arguments
         if not self.command_line_args.date:
-            date_string = datetime.date.today().isoformat()
+            date = datetime.date.today()
         else:
-            date_string = self.command_line_args.date
-        result = Database.filename_prefix + date_string + Database.filename_suffix
-        return result
-
-    def validate(self, filename=None):
-        """
-        Validates today's .CSV file.
+            date = self.command_line_args.date
+        # Rebuild the filename on the first call, or after midnight
+        if date != self.cached_date:
+            # Note that str() of a datetime.date is its ISO 8601 format
+            self.cached_date = date
+            self.cached_filename = DB_FILENAME_PREFIX + str(date) + DB_FILENAME_SUFFIX
+        return self.cached_filename
+
+    def validate(self, filename=None, full=False):
+        """
+        Validates today's .CSV file. Any waiting rows are written first. Only the rows that have
+        not yet passed a validation are read and checked, unless full is True, in which case the
+        whole file is re-checked.
         :return:
             DB_RESULT_OK
             DB_RESULT_GENERAL_FAILURE
+            DB_RESULT_NO_PERMISSION
             DB_RESULT_BAD_CHECKSUM
             DB_RESULT_CORRUPT_FILE
         """
@@ -418,31 +562,44 @@ class Database(Model):
         # Default to success
         result = DB_RESULT_OK
         try:
-            with open(filename, 'r', newline=Database.empty_string) as file:
-                db = csv.reader(file,
-                                delimiter=Database.delimiter_string,
-                                quotechar=Database.quote_string)
-                # Iterate over each row
-                for row in db:
-                    # Create a string from the joined list items of this row
-                    row_string = Database.delimiter_string.join(row)
-                    # Create the string to validate via checksum
-                    string_to_validate = row[Database.column_unix_time] \
-                                        + row[Database.column_full_name] \
-                                        + row[Database.column_email_address] \
-                                        + row[Database.column_phone_number]
-                    # Create a binary encoded representation of that same string
-                    bytes_to_validate = string_to_validate.encode(encoding=Database.encoding)
-                    # Calculate checksum and read the existing checksum
-                    fresh_checksum = zlib.adler32(bytes_to_validate)
-                    existing_checksum = int(row[Database.column_checksum])
+            # Make sure the rows waiting in memory are in the file
+            self.flush()
+            with open(filename, 'rb') as file:
+                # Skip the rows that have already been validated, unless the file has shrunk
+                offset = 0 if full else self.validated_offsets.get(filename, 0)
+                if offset > os.fstat(file.fileno()).st_size:
+                    offset = 0
+                file.seek(offset)
+                # Bind the constants and functions used for every row to local names
+                line_terminator = DB_LINE_TERMINATOR_BYTES
+                delimiter = DB_DELIMITER_BYTES
+                checksummed_columns = DB_CHECKSUMMED_COLUMNS
+                adler32 = zlib.adler32
+                # Iterate over each new row, reading one line at a time so memory use stays flat
+                # however large the file is. None of the columns ever need quoting, so each line
+                # can be split on the delimiter directly, and checksummed without decoding it.
+                validated_offset = offset
+                for line in file:
+                    row = line.rstrip(line_terminator).split(delimiter)
+                    # Chain the Adler-32 checksum through the fields, one at a time
+                    fresh_checksum = DB_CHECKSUM_SEED
+                    for column in checksummed_columns:
+                        fresh_checksum = adler32(row[column], fresh_checksum)
+                    # Read the existing checksum
+                    existing_checksum = int(row[DB_COLUMN_CHECKSUM])
                     # Fail if any row's checksum does not match
                     if (fresh_checksum != existing_checksum):
                         result = DB_RESULT_BAD_CHECKSUM
                         break
+                    validated_offset += len(line)
+            # Every row before the offset is valid, so later validations can start there
+            self.validated_offsets[filename] = validated_offset
             # Was there a checksum error?
             if result == DB_RESULT_BAD_CHECKSUM:
                 self.view.warn(WARNING_DB_VALIDATION.format(filename))
+        except FileNotFoundError:
+            # No rows have been written yet, so there is nothing to validate
+            pass
         except IndexError as e:
             # This is caused by a corrupt database file. However, in many cases it should be
             # possible to append data to the file.
@@ -452,7 +609,7 @@ class Database(Model):
             # User does not have permission to access the database file
             result = DB_RESULT_NO_PERMISSION
             self.view.error(ERROR_DB_PERMISSION.format(filename))
-        except:
+        except Exception:
             # Was any other exception thrown?
             result = DB_RESULT_GENERAL_FAILURE
             e = sys.exc_info()[0]
@@ -469,45 +626,111 @@ class Database(Model):
         :return:
             DB_RESULT_OK
             DB_RESULT_GENERAL_FAILURE
-            DB_RESULT_BAD_CHECKSUM
-            DB_RESULT_CORRUPT_FILE
+            DB_RESULT_NO_PERMISSION
+            DB_RESULT_BAD_CHECKSUM (only with --verify)
+            DB_RESULT_CORRUPT_FILE (only with --verify)
         """
         filename = self.todays_filename()
         # Default to success
         result = DB_RESULT_OK
         try:
-            with open(filename, 'a', newline=Database.empty_string) as file:
-                db = csv.writer(file,
-                                delimiter=Database.delimiter_string,
-                                quotechar=Database.quote_string)
-                # Get the current UNIX time
-                unix_time = int(time.time())
-                # Create the fake person
-                identity = PersonGenerator.new_identity()
-                # Prepare the data to be validated later via checksum
-                string_to_validate = str(unix_time) \
-                                    + identity[ID_NAME] \
-                                    + identity[ID_EMAIL] \
-                                    + identity[ID_PHONE]
-                bytes_to_validate = string_to_validate.encode(encoding=Database.encoding)
-                # Calculate the checksum
-                checksum = zlib.adler32(bytes_to_validate)
-                # Write the row data to the .CSV file
-                row = [unix_time, identity[ID_NAME], identity[ID_EMAIL], identity[ID_PHONE], checksum]
-                db.writerow(row)
-            # Re-validate the database after the write
-            result = self.validate(filename)
+            # Get the current UNIX time
+            unix_time = time.time_ns() // NANOSECONDS_PER_SECOND
+            # Create the fake person
+            full_name, email_address, phone_number = PersonGenerator.new_identity()
+            # Calculate the checksum one field at a time, chaining the running Adler-32 value
+            checksum = DB_CHECKSUM_SEED
+            for field in (str(unix_time), full_name, email_address, phone_number):
+                checksum = zlib.adler32(field.encode(encoding=DB_ENCODING), checksum)
+            with self.lock:
+                # Make sure the (possibly new) day's file is open
+                self.open(filename)
+                # Stage the row data, and write the stage to the .CSV file if it's time to
+                self.stage.write(DB_ROW_FORMAT.format(unix_time, full_name, email_address,
+                                                      phone_number, checksum))
+                if self.stage.tell() >= DB_FLUSH_SIZE \
+                    or time.monotonic() - self.last_flush_time >= DB_FLUSH_INTERVAL_SECONDS:
+                    self.flush()
+                elif not self.flush_timer:
+                    # Otherwise, make sure the row is written soon even if no more rows arrive
+                    self.flush_timer = threading.Timer(DB_FLUSH_INTERVAL_SECONDS,
+                                                       self.timed_flush)
+                    self.flush_timer.daemon = True
+                    self.flush_timer.start()
+            # Re-validate the database after the write, if requested
+            if self.command_line_args.verify:
+                result = self.validate(filename)
         except PermissionError:
             # User does not have permission to access the database file
             result = DB_RESULT_NO_PERMISSION
             self.view.error(ERROR_DB_PERMISSION.format(filename))
-        except:
+        except Exception:
             # Was any other exception thrown?
             result = DB_RESULT_GENERAL_FAILURE
             e = sys.exc_info()[0]
             self.view.error(EXCEPTION_GENERAL_MSG.format(e, 'Database.create_row()'))
         return result
 
+    def open(self, filename):
+        """
+        Opens a .CSV file for appending, unless it is already open. Any other open file is closed,
+        after its waiting rows have been written.
+        :return: None
+        :raises: PermissionError: The user does not have permission to access the file
+        """
+        if filename != self.filename:
+            self.close()
+            self.file = open(filename, 'a', newline=DB_EMPTY_STRING,
+                             encoding=DB_ENCODING)
+            self.filename = filename
+        return
+
+    def flush(self):
+        """
+        Writes the waiting rows to the open .CSV file.
+        :return: None
+        """
+        with self.lock:
+            # Any pending timed flush is no longer needed
+            if self.flush_timer:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            if self.stage.tell():
+                # Empty the stage before writing, so the same rows can never be written twice
+                staged_rows = self.stage.getvalue()
+                self.stage.seek(0)
+                self.stage.truncate()
+                self.file.write(staged_rows)
+                self.file.flush()
+            self.last_flush_time = time.monotonic()
+        return
+
+    def timed_flush(self):
+        """
+        Writes the waiting rows when the flush timer fires. Runs on the timer's thread, so any
+        exception is reported rather than raised.
+        :return: None
+        """
+        try:
+            self.flush()
+        except:
+            e = sys.exc_info()[0]
+            self.view.error(EXCEPTION_GENERAL_MSG.format(e, 'Database.timed_flush()'))
+        return
+
+    def close(self):
+        """
+        Writes any waiting rows, then closes the open .CSV file, if there is one.
+        :return: None
+        """
+        with self.lock:
+            if self.file:
+                self.flush()
+                self.file.close()
+                self.file = None
+                self.filename = None
+        return
+
 
 class Screen(View):
     """
@@ -519,21 +742,27 @@ class Screen(View):
 
     def update(self):
         """
-        Sends waiting buffer contents to the screen.
+        Sends waiting buffer contents (if there are any) to the screen.
         :return: None
         """
-        print(self.buffer)
-        self.buffer = ''
+        if self.buffer:
+            print(self.buffer)
+            self.buffer = ''
         return
 
 
 class Log(Screen):
     """
     This class logs application events to the screen.
+    Messages are buffered until update() is called, except for [OK], [FAIL] and [ERROR]
+    messages, which are shown immediately (along with anything buffered before them).
     """
 
     prefix_braces = ['[ ', ' ]']
     prefix_separator = '  '
+    # Assembled once from the pieces above: "[ PREFIX ]  message"
+    line_format = prefix_braces[0] + '{0}' + prefix_braces[1] + prefix_separator + '{1}'
+    line_separator = '\n'
     system_ok_string = 'OK'
     system_fail_string = 'FAIL'
     debug_string = 'DEBUG'
@@ -555,6 +784,7 @@ class Log(Screen):
                 self.__printlog(self.system_ok_string, message)
             else:
                 self.__printlog(self.system_fail_string, message)
+            self.update()
         return
 
     def debug(self, message):
@@ -591,16 +821,17 @@ class Log(Screen):
         """
         if self.level <= LOG_LEVEL_ERROR:
             self.__printlog(self.error_string, message)
+            self.update()
         return
 
     def __printlog(self, prefix_string, message):
         """
-        Appends the appropriate log message to the MVC view's buffer, and triggers an update.
+        Appends the appropriate log message to the MVC view's buffer.
         :return: None
         """
-        self.buffer += self.prefix_braces[0] + prefix_string + self.prefix_braces[1] \
-                        + self.prefix_separator + message
-        self.update()
+        if self.buffer:
+            self.buffer += self.line_separator
+        self.buffer += self.line_format.format(prefix_string, message)
         return
 
 
@@ -616,122 +847,59 @@ class PersonGenerator():
     >> (Announcer's voice) 'It looks like a giant hack.' <<
     """
 
-    __first_names = ['Robert', 'Shawn', 'William', 'James', 'Oliver', 'Benjamin', \
-                    'Elijah', 'Lucas', 'Dick', 'Logan', 'Alexander', 'Ethan', \
-                    'Jacob', 'Michael', 'Daniel', 'Henry', 'Jackson', 'Sebastian', \
-                    'Peter', 'Matthew', 'Samuel', 'David', 'Joseph', 'Carter', \
-                    'Mary', 'Patricia', 'Linda', 'Barbara', 'Elizabeth', 'Jennifer', \
-                    'Maria', 'Susan', 'Margaret', 'Dorothy', 'Lisa', 'Nancy', \
-                    'Karen', 'Betty', 'Helen', 'Sandra', 'Donna', 'Carol', \
-                    'Ruth', 'Sharon', 'Michelle', 'Laura', 'Sarah', 'Kimberly']
-    __last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Miller', \
-                    'Davis', 'Wilson', 'Anderson', 'Taylor', 'Moore', 'Thomas', \
-                    'Jackson', 'White', 'Harris', 'Martin', 'Thompson', 'Garcia', \
-                    'Martinez', 'Robinson', 'Clark', 'Rodriguez', 'Lewis', 'Lee', \
-                    'Walker', 'Hall', 'Allen', 'Young', 'Hernandez', 'King', \
-                    'Wang', 'Devi', 'Zhang', 'Li', 'Liu', 'Singh', \
-                    'Yang', 'Kumar', 'Wu', 'Xu']
-    __email_domains = ['gmail.com', 'outlook.com', 'yahoo.com', 'icloud.com', 'aol.com', 'mail.com']
+    # The class's own random number generator (seeded from the OS when it's created)
+    __rng = random.Random()
 
+    @staticmethod
     def new_identity():
         """
         Creates a new identity having a name, email address, and phone number.
         This is the public API interface for the PersonGenerator class.
-        :return: a List object containing [0:name 1:email 2:phone]
+        :return: a Tuple object containing (name, email, phone)
         """
-        # Initialize an empty list to store the result
-        result = ['', '', '']
-        # Calculate the length of the name lists
-        first_names_len = len(PersonGenerator.__first_names)
-        last_names_len = len(PersonGenerator.__last_names)
         # Choose a random first and last name
-        first_names_index = random.randrange(0, first_names_len)
-        last_names_index = random.randrange(0, last_names_len)
-        first_name = PersonGenerator.__first_names[first_names_index]
-        last_name = PersonGenerator.__last_names[last_names_index]
+        choice = PersonGenerator.__rng.choice
+        first_name, first_name_lower = choice(FIRST_NAME_PAIRS)
+        last_name, last_name_lower = choice(LAST_NAME_PAIRS)
         # Build the new name
-        result[ID_NAME] = first_name + ' ' + last_name
+        name = first_name + ' ' + last_name
         # Build the new email address
-        result[ID_EMAIL] = PersonGenerator.__generate_email(first_name, last_name)
+        email = PersonGenerator.__generate_email(first_name_lower, last_name_lower)
         # Build the new phone number
-        result[ID_PHONE] = PersonGenerator.__generate_phone_number()
+        phone = PersonGenerator.__generate_phone_number()
 
+        result = (name, email, phone)
         return result
 
+    @staticmethod
     def __generate_email(first_name, last_name):
         """
-        Generates a pseudo-random email address.
+        Generates a pseudo-random email address from lowercase first and last names.
         :return: a String object containing an email address.
         """
-        # Email style constants
-        STYLE_FIRST_DOT_LAST = 0
-        STYLE_LAST_DOT_FIRST = 1
-        STYLE_FIRST_LAST = 2
-        STYLE_F_LAST = 3
-        # Select a random email style
-        style = random.randrange(STYLE_FIRST_DOT_LAST, STYLE_F_LAST + 1)
-        # Make the first and last names lowercase
-        first_name = first_name.lower()
-        last_name = last_name.lower()
-        # Calculate the length of the email domain list
-        email_domains_len = len(PersonGenerator.__email_domains)
-        # Choose a random email domain
-        email_domains_index = random.randrange(0, email_domains_len)
-        domain_name = PersonGenerator.__email_domains[email_domains_index]
-        # Format the email username
-        if style == STYLE_FIRST_DOT_LAST:
-            username = first_name + '.' + last_name
-        elif style == STYLE_LAST_DOT_FIRST:
-            username = last_name + '.' + first_name
-        elif style == STYLE_FIRST_LAST:
-            username = first_name + last_name
-        elif style == STYLE_F_LAST:
-            username = first_name[0] + last_name
+        # Select a random email style and domain
+        choice = PersonGenerator.__rng.choice
+        email_format = choice(EMAIL_FORMATS)
+        domain_name = choice(EMAIL_DOMAINS)
         # Return the finished email address
-        result = username + '@' + domain_name
+        result = email_format.format(first_name, last_name, first_name[0], domain_name)
         return result
 
+    @staticmethod
     def __generate_phone_number():
         """
         Generates a pseudo-random NANP 10-digit phone number.
+        Each part is drawn directly from its valid range, so no retries are needed.
         :return: a String object containing a phone nunmber in the format NPA-NXX-XXXX.
         """
-        nanp_regex = re.compile(REGEX_PHONE_US10DIGIT)
-        # Generate random phone numbers until we get one that's valid according to the NANP
-        phone_number_is_invalid = True
-        while phone_number_is_invalid:
-            result = str(PersonGenerator.__generate_npa()) + '-' \
-                        + str(PersonGenerator.__generate_nxx()) + '-' \
-                        + str(PersonGenerator.__generate_xxxx())
-            if nanp_regex.match(result):
-                phone_number_is_invalid = False
-        return result
-
-    def __generate_npa():
-        """
-        Attempts to generate a pseudo-random NANP NPA (NPA-NXX-XXXX).
-        Note that the number returned by this function may not be valid according to the NANP.
-        :return: an int between 0-999
-        """
-        result = random.randrange(0, 1000)
-        return result
-
-    def __generate_nxx():
-        """
-        Attempts to generate a pseudo-random NANP NXX (NPA-NXX-XXXX).
-        Note that the number returned by this function may not be valid according to the NANP.
-        :return: an int between 0-999
-        """
-        result = random.randrange(0, 1000)
-        return result
-
-    def __generate_xxxx():
-        """
-        Attempts to generate a pseudo-random NANP XXXX (NPA-NXX-XXXX).
-        Note that the number returned by this function may not be valid according to the NANP.
-        :return: an int between 0-9999
-        """
-        result = random.randrange(0, 10000)
+        randrange = PersonGenerator.__rng.randrange
+        # The NANP requires an NPA matching [2-9][0-8][0-9]
+        npa = randrange(2, 10) * 100 + randrange(0, 9) * 10 + randrange(0, 10)
+        # The NANP requires an NXX matching [2-9][0-9][0-9]
+        nxx = randrange(200, 1000)
+        # Any four digits are a valid XXXX
+        xxxx = randrange(0, 10000)
+        result = PHONE_NUMBER_FORMAT.format(npa, nxx, xxxx)
         return result
 
 